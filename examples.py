@@ -6,6 +6,7 @@ import time
 
 from ophyd import Device, Component as Cpt
 from ophyd import EpicsSignal, Signal
+from ophyd.sim import SynSignal
 from ophyd.status import DeviceStatus
 
 from triple_axis.devices import create_energy_selector_device
@@ -68,8 +69,6 @@ def bluesky_usage_example():
         final_energy = AnalyzerDevice(prefix='HFIR:', name='ef')
         
         # Mock detector
-        from ophyd.sim import SynSignal
-        
         class Detector(Device):
             counts = Cpt(SynSignal, kind='hinted')
             def __init__(self, *args, **kwargs):
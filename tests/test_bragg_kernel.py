@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+from tavi.instrument.components.mono_ana import MonoAna
+
+from triple_axis._bragg_kernel import (
+    bragg_angle_from_energy,
+    bragg_angles_from_energies,
+    energy_from_bragg_angle,
+)
+
+
+@pytest.fixture
+def mono_pg002():
+    """Fixture for a Monochromator using PG(002) reflection."""
+    param_dict = {
+        "type": "PG002",
+        "sense": "-",
+        "mosaic_h": 30,
+        "mosaic_v": 30,
+    }
+    mono = MonoAna(param_dict=param_dict, component_name="mono")
+    return mono
+
+
+@pytest.mark.parametrize("energy", [3.0, 5.0, 14.45, 35.0])
+def test_bragg_angle_matches_tavi(mono_pg002, energy):
+    """Test the kernel agrees with MonoAna for energy to angle."""
+    angle = bragg_angle_from_energy(energy, mono_pg002.d_spacing, mono_pg002._sense)
+    assert np.isclose(angle, mono_pg002.get_bragg_angle_from_energy(energy))
+
+
+@pytest.mark.parametrize("angle", [-10.0, -20.7684, -45.0])
+def test_energy_matches_tavi(mono_pg002, angle):
+    """Test the kernel agrees with MonoAna for angle to energy."""
+    energy = energy_from_bragg_angle(angle, mono_pg002.d_spacing)
+    assert np.isclose(energy, mono_pg002.get_energy_from_bragg_angle(angle))
+
+
+@pytest.mark.parametrize("energy", [1.0, 0.0, -5.0, float("nan")])
+def test_unreachable_energy_is_nan(mono_pg002, energy):
+    """Test that energies outside the arcsin domain give NaN."""
+    angle = bragg_angle_from_energy(energy, mono_pg002.d_spacing, mono_pg002._sense)
+    assert np.isnan(angle)
+
+
+def test_zero_angle_is_infinite(mono_pg002):
+    """Test that a zero Bragg angle gives infinite energy."""
+    assert np.isinf(energy_from_bragg_angle(0.0, mono_pg002.d_spacing))
+
+
+def test_vectorized_matches_scalar(mono_pg002):
+    """Test the array version agrees with the scalar kernel, NaNs included."""
+    energies = np.array([1.0, 3.0, 5.0, 14.45, 35.0])
+    d_spacing, sense = mono_pg002.d_spacing, mono_pg002._sense
+    angles = bragg_angles_from_energies(energies, d_spacing, sense)
+    expected = [bragg_angle_from_energy(e, d_spacing, sense) for e in energies]
+    assert angles.shape == energies.shape
+    assert np.allclose(angles, expected, equal_nan=True)
+
+
+def test_vectorized_scalar_input(mono_pg002):
+    """Test that a scalar energy still gives a 1-d array."""
+    angles = bragg_angles_from_energies(14.45, mono_pg002.d_spacing, mono_pg002._sense)
+    assert isinstance(angles, np.ndarray)
+    assert angles.shape == (1,)
@@ -7,6 +7,9 @@ following patterns from pv_name_examples.py.
 This version focuses on testing the core logic without EPICS dependencies.
 """
 
+from unittest.mock import patch
+
+import numpy as np
 import pytest
 from tavi.instrument.components.mono_ana import MonoAna
 
@@ -71,6 +74,29 @@ class TestCreateEnergySelectorDevice:
         assert any(base.__name__ == "Device" for base in MonoDevice.__mro__)
         assert any(base.__name__ == "Device" for base in AnalyzerDevice.__mro__)
 
+    def test_factory_caches_class(self):
+        """Test that identical suffixes return the same cached class."""
+        MonoDevice = create_energy_selector_device(
+            pv_a1_suffix="mono:theta", pv_a2_suffix="mono:two_theta"
+        )
+        assert MonoDevice is create_energy_selector_device(
+            pv_a1_suffix="mono:theta", pv_a2_suffix="mono:two_theta"
+        )
+        assert MonoDevice is not create_energy_selector_device(
+            pv_a1_suffix="analyzer:angle", pv_a2_suffix="analyzer:detector_angle"
+        )
+
+    def test_factory_cache_ignores_call_style(self):
+        """Test positional, keyword and default calls share the cached class."""
+        assert create_energy_selector_device(
+            "mono:theta", "mono:two_theta"
+        ) is create_energy_selector_device(
+            pv_a1_suffix="mono:theta", pv_a2_suffix="mono:two_theta"
+        )
+        assert create_energy_selector_device() is create_energy_selector_device(
+            "A1", "A2"
+        )
+
     def test_create_monochromator(self, mono_pg002):
         """ "
         Run this command in termial: python3 -m mono_iocs --list-pvs
@@ -84,3 +110,144 @@ class TestCreateEnergySelectorDevice:
         assert mono.read()["mono_energy"]["value"] == 14.45
         mono.set(1)  # too low
         assert mono.read()["mono_energy"]["value"] == 14.45  # unchanged
+
+    def test_set_d_spacing(self, mono_pg002):
+        """Test that set_d_spacing refreshes the cached crystal parameters."""
+        MonoDevice = create_energy_selector_device(
+            pv_a1_suffix="mono:theta", pv_a2_suffix="mono:two_theta"
+        )
+        mono = MonoDevice(params=mono_pg002, name="mono")
+        assert mono._d == mono_pg002.d_spacing
+        assert mono._sense == -1.0
+
+        with patch.object(mono.pv_a1, "get", return_value=-20.0), patch.object(
+            mono.pv_a2, "get", return_value=-40.0
+        ):
+            mono.set_d_spacing(1.67708)
+            assert mono._d == 1.67708
+            config = mono.read_configuration()
+            assert config["mono_d_spacing"]["value"] == 1.67708
+
+            # Changes made directly on params are only reported once picked up
+            mono_pg002.sense = "+"
+            mono_pg002.d_spacing = 3.35416
+            config = mono.read_configuration()
+            assert config["mono_d_spacing"]["value"] == 1.67708
+            assert config["mono_sense"]["value"] == "-"
+
+            mono.set_d_spacing()
+            assert mono._d == 3.35416
+            assert mono._sense == 1.0
+            config = mono.read_configuration()
+            assert config["mono_d_spacing"]["value"] == 3.35416
+            assert config["mono_sense"]["value"] == "+"
+
+    def test_read_returns_new_dicts(self, mono_pg002):
+        """Test that readings kept across a set() are not modified."""
+        MonoDevice = create_energy_selector_device(
+            pv_a1_suffix="mono:theta", pv_a2_suffix="mono:two_theta"
+        )
+        mono = MonoDevice(params=mono_pg002, name="mono")
+        with patch.object(mono.pv_a1, "get", return_value=-20.0), patch.object(
+            mono.pv_a2, "get", return_value=-40.0
+        ), patch.object(mono.pv_a1, "put"), patch.object(
+            mono.pv_a2, "put"
+        ), patch.object(mono, "_compute_energy"):
+            first = mono.read()
+            mono.set(14.45)
+            second = mono.read()
+            assert second is not first
+            assert first["mono_energy"]["value"] == 0.0
+            assert second["mono_energy"]["value"] == 14.45
+
+            config = mono.read_configuration()
+        assert list(config) == [
+            "mono_d_spacing",
+            "mono_sense",
+            "mono_pv_a1",
+            "mono_pv_a2",
+        ]
+        assert config["mono_sense"]["value"] == "-"
+        assert config["mono_pv_a1"]["value"] == -20.0
+        timestamps = {reading["timestamp"] for reading in config.values()}
+        assert len(timestamps) == 1
+
+    def test_compute_energy_skips_invalid_angles(self, mono_pg002):
+        """Test that a NaN or wrong-sense angle leaves the energy untouched."""
+        MonoDevice = create_energy_selector_device(
+            pv_a1_suffix="mono:theta", pv_a2_suffix="mono:two_theta"
+        )
+        mono = MonoDevice(params=mono_pg002, name="mono")
+        mono.energy.put(14.45)
+        for angle in (float("nan"), 20.0, 0.0):
+            with patch.object(mono.pv_a1, "get", return_value=angle):
+                mono._compute_energy()
+            assert mono.energy.get() == 14.45
+
+        with patch.object(mono.pv_a1, "get", return_value=-20.0):
+            mono._compute_energy()
+        expected = mono_pg002.get_energy_from_bragg_angle(-20.0)
+        assert mono.energy.get() == pytest.approx(expected)
+
+    def test_angles_for_energy(self, mono_pg002):
+        """Test single-energy angle computation and its error."""
+        MonoDevice = create_energy_selector_device(
+            pv_a1_suffix="mono:theta", pv_a2_suffix="mono:two_theta"
+        )
+        mono = MonoDevice(params=mono_pg002, name="mono")
+        theta, two_theta = mono.angles_for_energy(14.45)
+        assert type(theta) is float
+        assert theta == pytest.approx(mono_pg002.get_bragg_angle_from_energy(14.45))
+        assert two_theta == 2 * theta
+        with pytest.raises(ValueError, match="Invalid energy value"):
+            mono.angles_for_energy(1)  # too low
+
+    def test_set_energies(self, mono_pg002):
+        """Test batched angle computation for a list of energies."""
+        MonoDevice = create_energy_selector_device(
+            pv_a1_suffix="mono:theta", pv_a2_suffix="mono:two_theta"
+        )
+        mono = MonoDevice(params=mono_pg002, name="mono")
+        energies = [14.45, 1, 30.0]  # the middle one is too low
+        theta, two_theta = mono.set_energies(energies)
+        assert theta.shape == (3,)
+        assert theta[0] == pytest.approx(mono_pg002.get_bragg_angle_from_energy(14.45))
+        assert np.isnan(theta[1])
+        assert theta[2] == pytest.approx(mono_pg002.get_bragg_angle_from_energy(30.0))
+        assert np.allclose(two_theta, 2 * theta, equal_nan=True)
+
+        theta, two_theta = mono.set_energies(14.45)
+        assert isinstance(theta, np.ndarray) and theta.shape == (1,)
+        assert isinstance(two_theta, np.ndarray) and two_theta.shape == (1,)
+        assert theta[0] == pytest.approx(mono_pg002.get_bragg_angle_from_energy(14.45))
+
+    def test_set_moves_both_motors(self, mono_pg002):
+        """Test that set() always puts both angles and finishes its status."""
+        MonoDevice = create_energy_selector_device(
+            pv_a1_suffix="mono:theta", pv_a2_suffix="mono:two_theta"
+        )
+        mono = MonoDevice(params=mono_pg002, name="mono")
+        theta = mono_pg002.get_bragg_angle_from_energy(14.45)
+        with patch.object(mono.pv_a1, "put") as put_a1, patch.object(
+            mono.pv_a2, "put"
+        ) as put_a2, patch.object(mono, "_compute_energy"):
+            first = mono.set(14.45)
+            second = mono.set(14.45)
+        assert put_a1.call_count == 2
+        assert put_a2.call_count == 2
+        assert put_a1.call_args.args[0] == pytest.approx(theta)
+        assert put_a2.call_args.args[0] == pytest.approx(2 * theta)
+        assert first is not second
+        assert first.done and first.success
+        assert mono.energy.get() == 14.45
+
+    def test_set_invalid_energy_fails_status(self, mono_pg002):
+        """Test that an unreachable energy gives a failed status."""
+        MonoDevice = create_energy_selector_device(
+            pv_a1_suffix="mono:theta", pv_a2_suffix="mono:two_theta"
+        )
+        mono = MonoDevice(params=mono_pg002, name="mono")
+        status = mono.set(1)
+        assert status.done and not status.success
+        with pytest.raises(ValueError, match="Invalid energy value"):
+            status.wait(1)
@@ -0,0 +1,53 @@
+"""Bragg-law kernels for the energy selector hot path.
+
+Same physics as ``tavi.instrument.components.mono_ana.MonoAna``, reduced to
+plain floats and the ``math`` module so each scan point avoids NumPy and
+attribute dispatch.
+"""
+
+import math
+
+import numpy as np
+
+# Neutron wavelength in angstrom is 9.045 / sqrt(E) with E in meV
+_LAMBDA_SQRT_MEV = 9.045
+# E = 81.81 / lambda**2, with lambda in angstrom and E in meV
+_E_LAMBDA2 = 81.81
+_DEG2RAD = math.pi / 180.0
+_RAD2DEG = 180.0 / math.pi
+
+
+def bragg_angle_from_energy(energy, d_spacing, sense):
+    """
+    Bragg angle in degrees for an energy in meV.
+
+    Returns NaN when the energy cannot be reached with this d-spacing.
+    """
+    if not energy > 0.0:
+        return math.nan
+    sin_theta = _LAMBDA_SQRT_MEV / (2.0 * d_spacing * math.sqrt(energy))
+    if not -1.0 <= sin_theta <= 1.0:
+        return math.nan
+    return sense * math.asin(sin_theta) * _RAD2DEG
+
+
+def energy_from_bragg_angle(angle, d_spacing):
+    """Energy in meV for a Bragg angle in degrees."""
+    sin_theta = math.sin(angle * _DEG2RAD)
+    denominator = 4.0 * d_spacing * d_spacing * sin_theta * sin_theta
+    if denominator == 0.0:
+        return math.inf
+    return _E_LAMBDA2 / denominator
+
+
+def bragg_angles_from_energies(energies, d_spacing, sense):
+    """
+    Vectorized ``bragg_angle_from_energy`` for a whole scan.
+
+    Always returns an array, at least 1-d, even for a scalar energy.
+    Unreachable energies give NaN entries instead of raising or warning.
+    """
+    energies = np.atleast_1d(np.asarray(energies, dtype=float))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        sin_theta = _LAMBDA_SQRT_MEV / (2.0 * d_spacing * np.sqrt(energies))
+        return sense * np.degrees(np.arcsin(sin_theta))
@@ -1,13 +1,20 @@
 """Calculates monochromator or analyzer energy as a function of angle and d-spacing"""
 
+import functools
+import math
 import time
 
-import numpy as np
 from ophyd import Component as Cpt
 from ophyd import Device, EpicsSignal, Signal
 from ophyd.status import DeviceStatus
 from tavi.instrument.components.mono_ana import MonoAna
 
+from triple_axis._bragg_kernel import (
+    bragg_angle_from_energy,
+    bragg_angles_from_energies,
+    energy_from_bragg_angle,
+)
+
 
 def create_energy_selector_device(pv_a1_suffix="A1", pv_a2_suffix="A2"):
     """
@@ -33,7 +40,17 @@ def create_energy_selector_device(pv_a1_suffix="A1", pv_a2_suffix="A2"):
     HB3 has mfocus, mtrans, marc, related to the vertical focusing of the monochromator.
     CTAX has xm1, ... xm7, qm1, ... qm7, related to the translation/rotation of the 7 horizontal focusing analyzer blades.
 
+    Classes are cached per suffix pair, so repeated calls with the same
+    suffixes return the same class instead of rebuilding it, whether they
+    are passed positionally, by keyword or left at their defaults.
+
     """
+    return _build_energy_selector_device(pv_a1_suffix, pv_a2_suffix)
+
+
+@functools.lru_cache(maxsize=None)
+def _build_energy_selector_device(pv_a1_suffix, pv_a2_suffix):
+    """Build the EnergySelectorDevice class, cached per suffix pair."""
 
     class EnergySelectorDevice(Device):
         """
@@ -54,23 +71,49 @@ def create_energy_selector_device(pv_a1_suffix="A1", pv_a2_suffix="A2"):
             super().__init__(prefix=prefix, name=name, **kwargs)
             self.params = params
 
+            # Plain-float copies of the crystal parameters for the hot path
+            self._d = float(params.d_spacing)
+            self._sense = float(params._sense)
+
+            # Reading keys used by read() and read_configuration()
+            self._energy_key = f"{self.name}_energy"
+            self._config_keys = tuple(
+                f"{self.name}_{key}" for key in ("d_spacing", "sense", "pv_a1", "pv_a2")
+            )
+
             # Set initial energy value
             self.energy.put(0.0)
 
             # Subscribe to angle changes to update energy
             self.pv_a1.subscribe(self._on_angle_change)
 
+        def set_d_spacing(self, d_spacing=None):
+            """
+            Set the d-spacing for energy calculations.
+
+            Called without an argument, picks up d_spacing and sense after
+            ``params`` was modified directly.
+            """
+            if d_spacing is not None:
+                self.params.d_spacing = d_spacing
+            self._d = float(self.params.d_spacing)
+            self._sense = float(self.params._sense)
+            self._compute_energy()
+
         def _compute_energy(self):
             """Compute energy based on current angle."""
+            angle = self.pv_a1.get()
+            if angle is None or angle != angle:  # None or NaN
+                return
+            if angle * self._sense <= 0.0:
+                # making sure the angle is in the correct sense
+                return
             try:
-                angle = self.pv_a1.get()
-                if np.isclose(np.sign(angle), self.params._sense):
-                    # making sure the angle is in the correct sense
-                    energy_value = self.mono.get_energy_from_bragg_angle(angle)
-                    self.energy.put(energy_value)
-            except Exception:
+                energy_value = energy_from_bragg_angle(angle, self._d)
+            except (TypeError, ValueError):
                 # Handle cases where angle is invalid
-                self.energy.put(0.0)
+                energy_value = 0.0
+            self.energy.put(energy_value)
 
         def _on_angle_change(self, value, old_value, **kwargs):
             """Called when angle PV changes."""
@@ -81,34 +124,66 @@ def create_energy_selector_device(pv_a1_suffix="A1", pv_a2_suffix="A2"):
             Set the energy by moving the monochromator angle.
             Returns a status object for Bluesky integration.
             """
-            status = DeviceStatus(self, timeout=30)
+            # Completed before returning, so no timeout (and callback thread)
+            status = DeviceStatus(self)
 
             try:  # Calculate required angle
-                theta = self.params.get_bragg_angle_from_energy(energy)
-                if np.isnan(theta):
-                    status.set_exception(ValueError("Invalid energy value"))
-                else:
-                    two_theta = 2 * theta
+                theta, two_theta = self.angles_for_energy(energy)
 
-                    # Move the motors (this would normally return status objects)
-                    self.pv_a1.put(theta)
-                    self.pv_a2.put(two_theta)
+                # Move the motors (this would normally return status objects)
+                self.pv_a1.put(theta)
+                self.pv_a2.put(two_theta)
 
-                    # Update our energy reading
-                    self.energy.put(energy)
+                # Update our energy reading
+                self.energy.put(energy)
 
-                    # Mark as complete (in real implementation, wait for motors)
-                    status.set_finished()
+                # Mark as complete (in real implementation, wait for motors)
+                status.set_finished()
 
             except Exception as e:
                 status.set_exception(e)
 
             return status
 
+        def angles_for_energy(self, energy):
+            """
+            Compute the motor angles for a single energy.
+
+            Returns
+            -------
+            tuple of float
+                (theta, two_theta) in degrees
+
+            Raises
+            ------
+            ValueError
+                If the energy cannot be reached with this crystal
+            """
+            theta = bragg_angle_from_energy(energy, self._d, self._sense)
+            if math.isnan(theta):
+                raise ValueError("Invalid energy value")
+            return theta, 2 * theta
+
+        def set_energies(self, energies):
+            """
+            Compute the motor angles for a whole list of energies at once.
+
+            Nothing is moved: the arrays are meant for a scan planner to
+            hand to the motor controllers. Unreachable energies give NaN.
+
+            Returns
+            -------
+            tuple of ndarray
+                (theta, two_theta) in degrees, one entry per energy; a
+                scalar energy gives arrays of length one
+            """
+            theta = bragg_angles_from_energies(energies, self._d, self._sense)
+            return theta, 2 * theta
+
         def read(self):
             """Return current energy reading."""
             return {
-                f"{self.name}_energy": {
+                self._energy_key: {
                     "value": self.energy.get(),
                     "timestamp": time.time(),
                 }
@@ -116,24 +191,17 @@ def create_energy_selector_device(pv_a1_suffix="A1", pv_a2_suffix="A2"):
 
         def read_configuration(self):
             """Return configuration information."""
-
+            timestamp = time.time()
+            # Report the cached values that set() and _compute_energy() use
+            values = (
+                self._d,
+                "+" if self._sense > 0 else "-",
+                self.pv_a1.get(),
+                self.pv_a2.get(),
+            )
             return {
-                f"{self.name}_d_spacing": {
-                    "value": self.params.d_spacing,
-                    "timestamp": time.time(),
-                },
-                f"{self.name}_sense": {
-                    "value": self.params.sense,
-                    "timestamp": time.time(),
-                },
-                f"{self.name}_pv_a1": {
-                    "value": self.pv_a1.get(),
-                    "timestamp": time.time(),
-                },
-                f"{self.name}_pv_a2": {
-                    "value": self.pv_a2.get(),
-                    "timestamp": time.time(),
-                },
+                key: {"value": value, "timestamp": timestamp}
+                for key, value in zip(self._config_keys, values)
             }
 
     return EnergySelectorDevice
@@ -1,6 +1,7 @@
 """Calculates monochromator or analyzer energy as a function of angle and d-spacing
 
 """
+import math
 import numpy as np
 import time
 
@@ -9,18 +10,49 @@ from ophyd import EpicsSignal, Signal
 
 from ophyd.status import DeviceStatus
 
+_DEG2RAD = math.pi / 180.0
+_RAD2DEG = 180.0 / math.pi
+_HC_OVER_2 = 81.81
+_SCALAR_TYPES = (int, float)
+
 # Mock tavi_interface for this example
 class MockTavi:
+    # Both conversions accept scalars or array-likes for either argument and
+    # broadcast them, so a whole scan can be converted in one call.
+    # Out-of-domain inputs give inf/nan instead of raising or warning.
+    # Plain scalars take a `math` fast path that skips ufunc dispatch.
     @staticmethod
     def tavi_bragg_angle_to_energy(angle, d_spacing):
         # E = (h*c) / (2*d*sin(theta))
         # Simplified calculation for demonstration
-        return 81.81 / (d_spacing * np.sin(np.radians(angle)))
+        if isinstance(angle, _SCALAR_TYPES) and isinstance(d_spacing, _SCALAR_TYPES):
+            if not math.isfinite(angle):
+                # Same NaN as np.sin on the array path
+                return math.nan
+            denominator = d_spacing * math.sin(angle * _DEG2RAD)
+            try:
+                return _HC_OVER_2 / denominator
+            except ZeroDivisionError:
+                return math.copysign(math.inf, denominator)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.divide(
+                _HC_OVER_2,
+                np.multiply(d_spacing, np.sin(np.radians(np.asarray(angle)))),
+            )
     
     @staticmethod
     def tavi_bragg_energy_to_angle(energy, d_spacing):
         # theta = arcsin((h*c) / (2*d*E))
-        return np.degrees(np.arcsin(81.81 / (d_spacing * energy)))
+        if isinstance(energy, _SCALAR_TYPES) and isinstance(d_spacing, _SCALAR_TYPES):
+            try:
+                return math.asin(_HC_OVER_2 / (d_spacing * energy)) * _RAD2DEG
+            except (ValueError, ZeroDivisionError):
+                # Same NaN as the arcsin domain error on the array path
+                return math.nan
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.degrees(
+                np.arcsin(np.divide(_HC_OVER_2, np.multiply(d_spacing, energy)))
+            )
 
 tavi = MockTavi()
 
@@ -26,9 +26,9 @@ class Instrument:
                 return devlist, vallist
       
         # Initial energy
-        a1, a2 = self.monochromator.set(e_init)
+        a1, a2 = self.monochromator.angles_for_energy(e_init)
         # Final energy
-        a5, a6 = self.analyzer.set(e_final)
+        a5, a6 = self.analyzer.angles_for_energy(e_final)
 
             
         # Q